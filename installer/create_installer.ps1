@@ -18,8 +18,14 @@ $exePath = Join-Path $SourceDir "esubpoena-tolls-tool.exe"
 $destPath = Join-Path $OutputDir "esubpoena-tolls-tool.exe"
 
 if (Test-Path $exePath) {
-    Copy-Item $exePath $destPath -Force
-    Write-Host "✓ Copied executable" -ForegroundColor Green
+    # Skip the copy when the packaged executable is already up to date
+    if ((Test-Path $destPath) -and
+        (Get-FileHash $exePath).Hash -eq (Get-FileHash $destPath).Hash) {
+        Write-Host "✓ Executable unchanged, skipping copy" -ForegroundColor Green
+    } else {
+        Copy-Item $exePath $destPath -Force
+        Write-Host "✓ Copied executable" -ForegroundColor Green
+    }
 } else {
     Write-Host "✗ Executable not found at $exePath" -ForegroundColor Red
     exit 1
@@ -118,11 +124,24 @@ $uninstallerContent | Out-File -FilePath $uninstallerPath -Encoding ASCII
 Write-Host "✓ Created uninstaller script" -ForegroundColor Green
 
 # Copy documentation
-$docs = @("README_RUST.md", "RUST_SETUP_GUIDE.md", "CONVERSION_SUMMARY.md")
-foreach ($doc in $docs) {
-    if (Test-Path $doc) {
-        Copy-Item $doc $OutputDir -Force
-        Write-Host "✓ Copied $doc" -ForegroundColor Green
+$docs = @("README_RUST.md", "RUST_SETUP_GUIDE.md", "CONVERSION_SUMMARY.md") | Where-Object { Test-Path $_ }
+if ($docs) {
+    # Copy all documentation in a single call instead of one Copy-Item per file
+    try {
+        Copy-Item $docs $OutputDir -Force -ErrorAction Stop
+        foreach ($doc in $docs) {
+            Write-Host "✓ Copied $doc" -ForegroundColor Green
+        }
+    } catch {
+        # Fall back to per-file copies so only the failing document is reported
+        foreach ($doc in $docs) {
+            try {
+                Copy-Item $doc $OutputDir -Force -ErrorAction Stop
+                Write-Host "✓ Copied $doc" -ForegroundColor Green
+            } catch {
+                Write-Warning "Failed to copy ${doc}: $_"
+            }
+        }
     }
 }
 
@@ -179,7 +198,9 @@ $zipName = "esubpoena-tolls-tool-v$Version-windows.zip"
 $zipPath = Join-Path $OutputDir $zipName
 
 Write-Host "Creating ZIP file..." -ForegroundColor Yellow
-Compress-Archive -Path "$OutputDir\*" -DestinationPath $zipPath -Force
+# Leave archives from earlier runs out so they are not compressed a second time
+$packageFiles = Get-ChildItem -Path $OutputDir -Exclude "*.zip"
+Compress-Archive -Path $packageFiles.FullName -DestinationPath $zipPath -Force
 Write-Host "✓ Created ZIP file: $zipName" -ForegroundColor Green
 
 Write-Host "`nInstallation package created successfully!" -ForegroundColor Green
@@ -1,6 +1,8 @@
 use crate::data_models::{Analytics, ProcessedCallRecord};
-use chrono::{DateTime, Utc};
-use std::collections::HashMap;
+use chrono::{NaiveDate, Timelike, Utc};
+use rustc_hash::FxHashMap;
+use std::collections::{HashMap, HashSet};
+use std::fmt::Write;
 use log::info;
 
 pub struct AnalyticsEngine;
@@ -18,11 +20,12 @@ impl AnalyticsEngine {
                 average_call_duration: 0.0,
                 unique_numbers: 0,
                 most_frequent_numbers: Vec::new(),
-                calls_by_day: HashMap::new(),
-                calls_by_hour: HashMap::new(),
+                calls_by_day: Vec::new(),
+                calls_by_hour: [0; 24],
                 longest_call: None,
                 shortest_call: None,
                 target_numbers: std::collections::HashSet::new(),
+                calls_by_target: HashMap::new(),
                 common_contacts: Vec::new(),
                 files_processed: std::collections::HashSet::new(),
                 date_range: (Utc::now(), Utc::now()),
@@ -30,14 +33,71 @@ impl AnalyticsEngine {
         }
         
         let total_calls = records.len();
-        let incoming_calls = records.iter()
-            .filter(|r| r.message_direction.eq_ignore_ascii_case("incoming"))
-            .count();
-        let outgoing_calls = total_calls - incoming_calls;
+        let mut incoming_calls = 0;
+        let mut total_duration_seconds: u64 = 0;
+        // Count on integer keys; days are only formatted once each at the end.
+        // The keys come from our own parsing, so SipHash's DoS resistance buys
+        // nothing here and FxHash is several times cheaper per lookup
+        let mut number_counts: FxHashMap<u64, usize> = FxHashMap::default();
+        let mut day_counts: FxHashMap<NaiveDate, usize> = FxHashMap::default();
+        // Exports are usually in time order, so consecutive records share a
+        // day; count runs and only touch the map when the day changes
+        let mut day_run: Option<(NaiveDate, usize)> = None;
+        let mut calls_by_hour = [0usize; 24];
+        let mut longest_call: Option<&ProcessedCallRecord> = None;
+        let mut shortest_call: Option<&ProcessedCallRecord> = None;
+        let mut min_date = records[0].start_time;
+        let mut max_date = records[0].start_time;
+        // Per-target call counts, so the report never rescans the records per target
+        let mut target_counts: FxHashMap<&str, usize> = FxHashMap::default();
+        let mut file_set: HashSet<&str> = HashSet::new();
+        
+        // Single pass feeding every accumulator
+        for record in records {
+            if record.is_incoming {
+                incoming_calls += 1;
+            }
+            total_duration_seconds += record.length_of_call as u64;
+            
+            *number_counts.entry(record.normalized_number).or_insert(0) += 1;
+            let day = record.start_time.date_naive();
+            match &mut day_run {
+                Some((run_day, run_count)) if *run_day == day => *run_count += 1,
+                _ => {
+                    if let Some((run_day, run_count)) = day_run.replace((day, 1)) {
+                        *day_counts.entry(run_day).or_insert(0) += run_count;
+                    }
+                }
+            }
+            calls_by_hour[record.start_time.hour() as usize] += 1;
+            
+            if longest_call.map_or(true, |longest| record.length_of_call >= longest.length_of_call) {
+                longest_call = Some(record);
+            }
+            // Exclude 0-second calls
+            if record.length_of_call > 0
+                && shortest_call.map_or(true, |shortest| record.length_of_call < shortest.length_of_call)
+            {
+                shortest_call = Some(record);
+            }
+            
+            min_date = min_date.min(record.start_time);
+            max_date = max_date.max(record.start_time);
+            
+            if !record.target_number.is_empty() {
+                *target_counts.entry(&record.target_number).or_insert(0) += 1;
+            }
+            if !record.source_file.is_empty() {
+                file_set.insert(&record.source_file);
+            }
+        }
+        
+        if let Some((run_day, run_count)) = day_run {
+            *day_counts.entry(run_day).or_insert(0) += run_count;
+        }
         
-        let total_duration_minutes: f64 = records.iter()
-            .map(|r| r.duration_minutes)
-            .sum();
+        let outgoing_calls = total_calls - incoming_calls;
+        let total_duration_minutes = total_duration_seconds as f64 / 60.0;
         
         let average_call_duration = if total_calls > 0 {
             total_duration_minutes / total_calls as f64
@@ -45,62 +105,34 @@ impl AnalyticsEngine {
             0.0
         };
         
-        let unique_numbers = records.iter()
-            .map(|r| &r.normalized_number)
-            .collect::<std::collections::HashSet<_>>()
-            .len();
-        
-        let mut number_counts: HashMap<String, usize> = HashMap::new();
-        for record in records {
-            *number_counts.entry(record.normalized_number.clone()).or_insert(0) += 1;
-        }
-        
-        let mut most_frequent_numbers: Vec<(String, usize)> = number_counts.into_iter().collect();
-        most_frequent_numbers.sort_by(|a, b| b.1.cmp(&a.1));
-        most_frequent_numbers.truncate(10); // Top 10
+        let unique_numbers = number_counts.len();
         
-        let mut calls_by_day: HashMap<String, usize> = HashMap::new();
-        for record in records {
-            *calls_by_day.entry(record.date.clone()).or_insert(0) += 1;
-        }
-        
-        let mut calls_by_hour: HashMap<u32, usize> = HashMap::new();
-        for record in records {
-            let hour = record.start_time.hour();
-            *calls_by_hour.entry(hour).or_insert(0) += 1;
+        // Top 10: partition the 10 most frequent to the front in O(n), then
+        // sort only those instead of every unique number
+        let by_frequency = |a: &(u64, usize), b: &(u64, usize)| b.1.cmp(&a.1).then(a.0.cmp(&b.0));
+        let mut most_frequent_numbers: Vec<(u64, usize)> = number_counts.into_iter().collect();
+        if most_frequent_numbers.len() > 10 {
+            most_frequent_numbers.select_nth_unstable_by(9, by_frequency);
+            most_frequent_numbers.truncate(10);
         }
+        most_frequent_numbers.sort_unstable_by(by_frequency);
         
-        let longest_call = records.iter()
-            .max_by(|a, b| a.length_of_call.cmp(&b.length_of_call))
-            .cloned();
-        
-        let shortest_call = records.iter()
-            .filter(|r| r.length_of_call > 0) // Exclude 0-second calls
-            .min_by(|a, b| a.length_of_call.cmp(&b.length_of_call))
-            .cloned();
-        
-        let min_date = records.iter()
-            .map(|r| r.start_time)
-            .min()
-            .unwrap_or_else(Utc::now);
-        
-        let max_date = records.iter()
-            .map(|r| r.start_time)
-            .max()
-            .unwrap_or_else(Utc::now);
+        let mut sorted_days: Vec<(NaiveDate, usize)> = day_counts.into_iter().collect();
+        sorted_days.sort_unstable_by_key(|(day, _)| *day);
+        let calls_by_day: Vec<(String, usize)> = sorted_days.into_iter()
+            .map(|(day, count)| (day.format("%Y-%m-%d").to_string(), count))
+            .collect();
         
+        let longest_call = longest_call.cloned();
+        let shortest_call = shortest_call.cloned();
         let date_range = (min_date, max_date);
         
         // Collect target numbers and source files
-        let target_numbers: std::collections::HashSet<String> = records.iter()
-            .map(|r| r.target_number.clone())
-            .filter(|t| !t.is_empty())
-            .collect();
-        
-        let files_processed: std::collections::HashSet<String> = records.iter()
-            .map(|r| r.source_file.clone())
-            .filter(|f| !f.is_empty())
+        let target_numbers: HashSet<String> = target_counts.keys().map(|target| target.to_string()).collect();
+        let calls_by_target: HashMap<String, usize> = target_counts.into_iter()
+            .map(|(target, count)| (target.to_string(), count))
             .collect();
+        let files_processed: HashSet<String> = file_set.into_iter().map(str::to_string).collect();
         
         // Find common contacts across target numbers
         let common_contacts = Self::find_common_contacts(records);
@@ -118,73 +150,73 @@ impl AnalyticsEngine {
             longest_call,
             shortest_call,
             target_numbers,
+            calls_by_target,
             common_contacts,
             files_processed,
             date_range,
         }
     }
     
-    pub fn generate_summary_report(analytics: &Analytics, records: &[ProcessedCallRecord]) -> String {
-        let mut report = String::new();
+    pub fn generate_summary_report(analytics: &Analytics) -> String {
+        // Fixed sections (headers, statistics, hours) plus one line per listed item
+        let line_count = 40 + analytics.most_frequent_numbers.len() + analytics.target_numbers.len()
+            + analytics.common_contacts.len() + analytics.calls_by_day.len();
+        let mut report = String::with_capacity(line_count * 64);
         
         report.push_str("=== TELECOMMUNICATION DATA ANALYSIS ===\n\n");
         
-        report.push_str(&format!("Total Calls: {}\n", analytics.total_calls));
-        report.push_str(&format!("Incoming Calls: {}\n", analytics.incoming_calls));
-        report.push_str(&format!("Outgoing Calls: {}\n", analytics.outgoing_calls));
-        report.push_str(&format!("Unique Phone Numbers: {}\n", analytics.unique_numbers));
-        report.push_str(&format!("Target Numbers: {}\n", analytics.target_numbers.len()));
-        report.push_str(&format!("Files Processed: {}\n", analytics.files_processed.len()));
-        report.push_str(&format!("Total Duration: {:.2} minutes\n", analytics.total_duration_minutes));
-        report.push_str(&format!("Average Call Duration: {:.2} minutes\n", analytics.average_call_duration));
+        let _ = writeln!(report, "Total Calls: {}", analytics.total_calls);
+        let _ = writeln!(report, "Incoming Calls: {}", analytics.incoming_calls);
+        let _ = writeln!(report, "Outgoing Calls: {}", analytics.outgoing_calls);
+        let _ = writeln!(report, "Unique Phone Numbers: {}", analytics.unique_numbers);
+        let _ = writeln!(report, "Target Numbers: {}", analytics.target_numbers.len());
+        let _ = writeln!(report, "Files Processed: {}", analytics.files_processed.len());
+        let _ = writeln!(report, "Total Duration: {:.2} minutes", analytics.total_duration_minutes);
+        let _ = writeln!(report, "Average Call Duration: {:.2} minutes", analytics.average_call_duration);
         
         if let Some(longest) = &analytics.longest_call {
-            report.push_str(&format!("Longest Call: {} seconds ({:.2} minutes) to {} on {}\n", 
-                longest.length_of_call, longest.duration_minutes, longest.remote_number, longest.date));
+            let _ = writeln!(report, "Longest Call: {} seconds ({:.2} minutes) to {} on {}", 
+                longest.length_of_call, longest.duration_minutes(), longest.remote_number, longest.date());
         }
         
         if let Some(shortest) = &analytics.shortest_call {
-            report.push_str(&format!("Shortest Call: {} seconds to {} on {}\n", 
-                shortest.length_of_call, shortest.remote_number, shortest.date));
+            let _ = writeln!(report, "Shortest Call: {} seconds to {} on {}", 
+                shortest.length_of_call, shortest.remote_number, shortest.date());
         }
         
-        report.push_str(&format!("Date Range: {} to {}\n", 
+        let _ = writeln!(report, "Date Range: {} to {}", 
             analytics.date_range.0.format("%Y-%m-%d"), 
-            analytics.date_range.1.format("%Y-%m-%d")));
+            analytics.date_range.1.format("%Y-%m-%d"));
         
         report.push_str("\n=== MOST FREQUENT NUMBERS ===\n");
         for (i, (number, count)) in analytics.most_frequent_numbers.iter().enumerate() {
-            report.push_str(&format!("{}. {} ({} calls)\n", i + 1, number, count));
+            let _ = writeln!(report, "{}. {:010} ({} calls)", i + 1, number, count);
         }
         
         report.push_str("\n=== TARGET NUMBERS ===\n");
         for target_num in &analytics.target_numbers {
-            let target_records: Vec<_> = records.iter()
-                .filter(|r| r.target_number == *target_num)
-                .collect();
-            report.push_str(&format!("• {}: {} calls\n", target_num, target_records.len()));
+            let call_count = analytics.calls_by_target.get(target_num).copied().unwrap_or(0);
+            let _ = writeln!(report, "• {}: {} calls", target_num, call_count);
         }
         
         if !analytics.common_contacts.is_empty() {
             report.push_str("\n=== COMMON CONTACTS ACROSS TARGET NUMBERS ===\n");
             for contact in &analytics.common_contacts {
                 let target_nums = contact.target_numbers.join(", ");
-                report.push_str(&format!("• {}: appears in {} target numbers ({})\n", 
-                    contact.number, contact.count, target_nums));
+                let _ = writeln!(report, "• {:010}: appears in {} target numbers ({})", 
+                    contact.number, contact.count, target_nums);
             }
         }
         
         report.push_str("\n=== CALLS BY DAY ===\n");
-        let mut sorted_days: Vec<_> = analytics.calls_by_day.iter().collect();
-        sorted_days.sort_by(|a, b| a.0.cmp(b.0));
-        for (day, count) in sorted_days {
-            report.push_str(&format!("{}: {} calls\n", day, count));
+        for (day, count) in &analytics.calls_by_day {
+            let _ = writeln!(report, "{}: {} calls", day, count);
         }
         
         report.push_str("\n=== CALLS BY HOUR ===\n");
-        for hour in 0..24 {
-            if let Some(count) = analytics.calls_by_hour.get(&hour) {
-                report.push_str(&format!("{:02}:00: {} calls\n", hour, count));
+        for (hour, count) in analytics.calls_by_hour.iter().enumerate() {
+            if *count > 0 {
+                let _ = writeln!(report, "{:02}:00: {} calls", hour, count);
             }
         }
         
@@ -192,46 +224,33 @@ impl AnalyticsEngine {
     }
     
     fn find_common_contacts(records: &[ProcessedCallRecord]) -> Vec<crate::data_models::CommonContact> {
-        use std::collections::HashMap;
-        
-        // Group records by target number
-        let mut target_groups: HashMap<String, std::collections::HashSet<String>> = HashMap::new();
+        // Invert in one pass: for each number, the distinct target numbers it appears under
+        let mut targets_by_number: FxHashMap<u64, Vec<&str>> = FxHashMap::default();
         for record in records {
             if !record.target_number.is_empty() {
-                target_groups.entry(record.target_number.clone())
-                    .or_insert_with(std::collections::HashSet::new)
-                    .insert(record.normalized_number.clone());
+                let targets = targets_by_number.entry(record.normalized_number).or_default();
+                // Only a handful of targets per export, so a linear check beats a set
+                if !targets.contains(&&*record.target_number) {
+                    targets.push(&record.target_number);
+                }
             }
         }
         
-        // Find numbers that appear in multiple target groups
-        if target_groups.len() <= 1 {
-            return Vec::new();
-        }
-        
-        let mut all_numbers = std::collections::HashSet::new();
-        for numbers in target_groups.values() {
-            all_numbers.extend(numbers.iter().cloned());
-        }
-        
-        let mut common_contacts = Vec::new();
-        for number in all_numbers {
-            let target_numbers_with_contact: Vec<String> = target_groups.iter()
-                .filter(|(_, numbers)| numbers.contains(&number))
-                .map(|(target, _)| target.clone())
-                .collect();
-            
-            if target_numbers_with_contact.len() > 1 {
-                common_contacts.push(crate::data_models::CommonContact {
+        // Numbers that appear under more than one target
+        let mut common_contacts: Vec<crate::data_models::CommonContact> = targets_by_number.into_iter()
+            .filter(|(_, targets)| targets.len() > 1)
+            .map(|(number, mut targets)| {
+                targets.sort_unstable();
+                crate::data_models::CommonContact {
                     number,
-                    target_numbers: target_numbers_with_contact,
-                    count: target_numbers_with_contact.len(),
-                });
-            }
-        }
+                    count: targets.len(),
+                    target_numbers: targets.into_iter().map(str::to_string).collect(),
+                }
+            })
+            .collect();
         
         // Sort by number of target numbers they appear in
-        common_contacts.sort_by(|a, b| b.count.cmp(&a.count));
+        common_contacts.sort_by(|a, b| b.count.cmp(&a.count).then(a.number.cmp(&b.number)));
         common_contacts
     }
 } 
\ No newline at end of file
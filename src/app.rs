@@ -1,18 +1,28 @@
 use crate::analytics::AnalyticsEngine;
-use crate::data_models::{Analytics, ProcessedCallRecord};
+use crate::data_models::{format_phone_number, Analytics, ProcessedCallRecord};
 use crate::excel_exporter::ExcelExporter;
 use crate::xml_parser::XmlParser;
 use eframe::egui;
 use log::{error, info};
-use std::path::PathBuf;
-use std::sync::mpsc;
+use std::collections::VecDeque;
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::{mpsc, Arc};
 use std::thread;
-use std::time::Duration;
+use std::time::{Duration, SystemTime};
+
+/// Fixed width of every column in the virtualized grids
+const GRID_COLUMN_WIDTH: f32 = 110.0;
+const MAX_MESSAGES: usize = 10;
 
 pub struct EsubpoenaApp {
-    // Data
-    call_records: Vec<ProcessedCallRecord>,
-    analytics: Option<Analytics>,
+    // Data, shared with the export thread without copying
+    call_records: Arc<Vec<ProcessedCallRecord>>,
+    analytics: Option<Arc<Analytics>>,
+    summary_report: Option<String>,
+    stat_cards: Vec<StatCard>,
+    loaded_files: Vec<FileSignature>,
+    pending_files: Vec<FileSignature>,
     
     // UI State
     drag_state: DragState,
@@ -20,11 +30,12 @@ pub struct EsubpoenaApp {
     selected_tab: Tab,
     
     // Messages
-    messages: Vec<Message>,
+    messages: VecDeque<Message>,
     
     // Background processing
     processing_sender: Option<mpsc::Sender<ProcessingMessage>>,
     processing_receiver: Option<mpsc::Receiver<ProcessingMessage>>,
+    export_receiver: Option<mpsc::Receiver<Result<PathBuf, String>>>,
 }
 
 #[derive(Debug, Clone)]
@@ -58,66 +69,248 @@ enum Message {
     Error(String),
 }
 
+/// Dashboard statistic, formatted once when new analytics arrive
+#[derive(Debug, Clone)]
+struct StatCard {
+    title: &'static str,
+    value: String,
+    icon: &'static str,
+}
+
+/// Identifies a dropped file by path, size and modification time
+#[derive(Debug, Clone, PartialEq)]
+struct FileSignature {
+    path: PathBuf,
+    len: u64,
+    modified: Option<SystemTime>,
+}
+
+impl FileSignature {
+    fn of(path: &Path) -> Self {
+        let metadata = std::fs::metadata(path).ok();
+        Self {
+            path: path.to_path_buf(),
+            len: metadata.as_ref().map_or(0, |metadata| metadata.len()),
+            modified: metadata.and_then(|metadata| metadata.modified().ok()),
+        }
+    }
+}
+
 #[derive(Debug)]
 enum ProcessingMessage {
     Progress(String),
-    Completed(Vec<ProcessedCallRecord>),
+    Completed(Vec<ProcessedCallRecord>, Analytics, String),
     Error(String),
 }
 
 impl EsubpoenaApp {
     pub fn new() -> Self {
         Self {
-            call_records: Vec::new(),
+            call_records: Arc::new(Vec::new()),
             analytics: None,
+            summary_report: None,
+            stat_cards: Vec::new(),
+            loaded_files: Vec::new(),
+            pending_files: Vec::new(),
             drag_state: DragState::None,
             processing_state: ProcessingState::Idle,
             selected_tab: Tab::Overview,
-            messages: Vec::new(),
+            messages: VecDeque::with_capacity(MAX_MESSAGES + 1),
             processing_sender: None,
             processing_receiver: None,
+            export_receiver: None,
         }
     }
     
     fn add_message(&mut self, message: Message) {
-        self.messages.push(message);
-        if self.messages.len() > 10 {
-            self.messages.remove(0);
+        self.messages.push_back(message);
+        if self.messages.len() > MAX_MESSAGES {
+            self.messages.pop_front();
         }
     }
     
-    fn process_file(&mut self, file_path: PathBuf) {
-        info!("Processing file: {:?}", file_path);
+    fn build_stat_cards(analytics: &Analytics) -> Vec<StatCard> {
+        vec![
+            StatCard { title: "Total Calls", value: analytics.total_calls.to_string(), icon: "📞" },
+            StatCard { title: "Incoming", value: analytics.incoming_calls.to_string(), icon: "📥" },
+            StatCard { title: "Outgoing", value: analytics.outgoing_calls.to_string(), icon: "📤" },
+            StatCard { title: "Unique Numbers", value: analytics.unique_numbers.to_string(), icon: "👥" },
+            StatCard { title: "Total Duration", value: format!("{:.1} min", analytics.total_duration_minutes), icon: "⏱️" },
+            StatCard { title: "Avg Duration", value: format!("{:.1} min", analytics.average_call_duration), icon: "📊" },
+        ]
+    }
+    
+    fn process_files(&mut self, file_paths: Vec<PathBuf>, ctx: &egui::Context) {
+        // Dropping the same unchanged files again would only rebuild identical results
+        let signatures: Vec<FileSignature> = file_paths.iter().map(|path| FileSignature::of(path)).collect();
+        if !self.call_records.is_empty() && signatures == self.loaded_files {
+            info!("Files unchanged since last load, skipping: {:?}", file_paths);
+            self.add_message(Message::Info("Files unchanged since last load; keeping current results".to_string()));
+            return;
+        }
+        self.pending_files = signatures;
+        
+        info!("Processing {} file(s): {:?}", file_paths.len(), file_paths);
         self.processing_state = ProcessingState::Processing;
-        self.add_message(Message::Info(format!("Processing file: {}", file_path.display())));
+        for file_path in &file_paths {
+            self.add_message(Message::Info(format!("Processing file: {}", file_path.display())));
+        }
         
         let (sender, receiver) = mpsc::channel();
-        self.processing_sender = Some(sender);
+        self.processing_sender = Some(sender.clone());
         self.processing_receiver = Some(receiver);
+        let ctx = ctx.clone();
         
         thread::spawn(move || {
-            match XmlParser::parse_file(&file_path) {
-                Ok(records) => {
-                    let _ = sender.send(ProcessingMessage::Completed(records));
+            // Parse the files on a bounded set of workers pulling from a shared
+            // index, then merge and build the analytics here so the UI thread
+            // only receives finished results
+            let worker_count = thread::available_parallelism()
+                .map_or(1, |count| count.get())
+                .min(file_paths.len());
+            let next_file = AtomicUsize::new(0);
+            
+            let mut results: Vec<Option<anyhow::Result<Vec<ProcessedCallRecord>>>> =
+                file_paths.iter().map(|_| None).collect();
+            thread::scope(|scope| {
+                let handles: Vec<_> = (0..worker_count)
+                    .map(|_| {
+                        let sender = sender.clone();
+                        let (ctx, next_file, file_paths) = (&ctx, &next_file, &file_paths);
+                        scope.spawn(move || {
+                            let mut parsed = Vec::new();
+                            loop {
+                                let index = next_file.fetch_add(1, Ordering::Relaxed);
+                                let Some(file_path) = file_paths.get(index) else { break };
+                                let result = XmlParser::parse_file(file_path);
+                                if let Ok(file_records) = &result {
+                                    Self::notify_ui(&sender, ctx, ProcessingMessage::Progress(format!(
+                                        "Parsed {}: {} call records",
+                                        file_path.display(),
+                                        file_records.len()
+                                    )));
+                                }
+                                parsed.push((index, result));
+                            }
+                            parsed
+                        })
+                    })
+                    .collect();
+                
+                for handle in handles {
+                    for (index, result) in handle.join().unwrap_or_default() {
+                        results[index] = Some(result);
+                    }
                 }
-                Err(e) => {
-                    let _ = sender.send(ProcessingMessage::Error(e.to_string()));
+            });
+            
+            let mut records = Vec::new();
+            let mut parsed_any = false;
+            for (file_path, result) in file_paths.iter().zip(results) {
+                // A file without a result was lost with a panicking worker
+                match result.unwrap_or_else(|| Err(anyhow::anyhow!("XML parser thread panicked"))) {
+                    Ok(file_records) => {
+                        parsed_any = true;
+                        records.extend(file_records);
+                    }
+                    Err(e) => {
+                        Self::notify_ui(&sender, &ctx, ProcessingMessage::Error(format!("{}: {}", file_path.display(), e)));
+                    }
                 }
             }
+            
+            if parsed_any {
+                let analytics = AnalyticsEngine::generate_analytics(&records);
+                let summary_report = AnalyticsEngine::generate_summary_report(&analytics);
+                Self::notify_ui(&sender, &ctx, ProcessingMessage::Completed(records, analytics, summary_report));
+            }
         });
     }
     
-    fn export_to_excel(&mut self) {
+    /// Sends a worker message and wakes the UI; egui otherwise only repaints on input
+    fn notify_ui<T>(sender: &mpsc::Sender<T>, ctx: &egui::Context, message: T) {
+        let _ = sender.send(message);
+        ctx.request_repaint();
+    }
+    
+    fn export_to_excel(&mut self, ctx: &egui::Context) {
         if self.call_records.is_empty() {
             self.add_message(Message::Warning("No data to export".to_string()));
             return;
         }
         
+        if self.export_receiver.is_some() {
+            self.add_message(Message::Warning("An export is already in progress".to_string()));
+            return;
+        }
+        
         if let Some(analytics) = &self.analytics {
             let output_path = PathBuf::from("telecommunication_analysis.xlsx");
+            let records = Arc::clone(&self.call_records);
+            let analytics = Arc::clone(analytics);
+            
+            let (sender, receiver) = mpsc::channel();
+            self.export_receiver = Some(receiver);
+            let ctx = ctx.clone();
+            self.add_message(Message::Info(format!("Exporting to: {}", output_path.display())));
             
-            match ExcelExporter::export_data(&self.call_records, analytics, &output_path) {
-                Ok(_) => {
+            // Writing large workbooks takes seconds; keep it off the UI thread
+            thread::spawn(move || {
+                let result = ExcelExporter::export_data(&records, &analytics, &output_path)
+                    .map(|_| output_path)
+                    .map_err(|e| e.to_string());
+                Self::notify_ui(&sender, &ctx, result);
+            });
+        }
+    }
+}
+
+impl eframe::App for EsubpoenaApp {
+    fn update(&mut self, ctx: &egui::Context, _frame: &mut eframe::Frame) {
+        // Drain everything queued since the last frame, so a burst of per-file
+        // progress messages is applied in one repaint rather than one per frame
+        let messages: Vec<ProcessingMessage> = match &self.processing_receiver {
+            Some(receiver) => receiver.try_iter().collect(),
+            None => Vec::new(),
+        };
+        for message in messages {
+            match message {
+                ProcessingMessage::Progress(msg) => {
+                    self.add_message(Message::Info(msg));
+                }
+                ProcessingMessage::Completed(records, analytics, summary_report) => {
+                    self.call_records = Arc::new(records);
+                    self.stat_cards = Self::build_stat_cards(&analytics);
+                    self.analytics = Some(Arc::new(analytics));
+                    self.summary_report = Some(summary_report);
+                    self.loaded_files = std::mem::take(&mut self.pending_files);
+                    self.processing_state = ProcessingState::Completed;
+                    self.add_message(Message::Success(format!(
+                        "Successfully processed {} call records",
+                        self.call_records.len()
+                    )));
+                }
+                ProcessingMessage::Error(error_msg) => {
+                    // Errors arrive before Completed; forgetting the signatures keeps
+                    // a partly failed set from being skipped as unchanged next time
+                    self.pending_files.clear();
+                    self.processing_state = ProcessingState::Error(error_msg.clone());
+                    self.add_message(Message::Error(error_msg));
+                }
+            }
+        }
+        
+        // Check for a finished background export
+        let export_result = self.export_receiver.as_ref().map(|receiver| receiver.try_recv());
+        if let Some(Err(mpsc::TryRecvError::Disconnected)) = export_result {
+            // The export thread died without reporting (e.g. it panicked); clear
+            // the slot so later exports are not refused forever
+            self.export_receiver = None;
+            self.add_message(Message::Error("Export failed: export thread exited unexpectedly".to_string()));
+        } else if let Some(Ok(result)) = export_result {
+            self.export_receiver = None;
+            match result {
+                Ok(output_path) => {
                     self.add_message(Message::Success(format!(
                         "Successfully exported to: {}",
                         output_path.display()
@@ -128,34 +321,6 @@ impl EsubpoenaApp {
                 }
             }
         }
-    }
-}
-
-impl eframe::App for EsubpoenaApp {
-    fn update(&mut self, ctx: &egui::Context, _frame: &mut eframe::Frame) {
-        // Check for background processing messages
-        if let Some(receiver) = &self.processing_receiver {
-            if let Ok(message) = receiver.try_recv() {
-                match message {
-                    ProcessingMessage::Progress(msg) => {
-                        self.add_message(Message::Info(msg));
-                    }
-                    ProcessingMessage::Completed(records) => {
-                        self.call_records = records;
-                        self.analytics = Some(AnalyticsEngine::generate_analytics(&self.call_records));
-                        self.processing_state = ProcessingState::Completed;
-                        self.add_message(Message::Success(format!(
-                            "Successfully processed {} call records",
-                            self.call_records.len()
-                        )));
-                    }
-                    ProcessingMessage::Error(error_msg) => {
-                        self.processing_state = ProcessingState::Error(error_msg.clone());
-                        self.add_message(Message::Error(error_msg));
-                    }
-                }
-            }
-        }
         
         egui::CentralPanel::default().show(ctx, |ui| {
             self.render_header(ui);
@@ -177,7 +342,7 @@ impl EsubpoenaApp {
             ui.heading("📞 eSubpoena Tolls Tool");
             ui.with_layout(egui::Layout::right_to_left(egui::Align::Center), |ui| {
                 if ui.button("Export to Excel").clicked() {
-                    self.export_to_excel();
+                    self.export_to_excel(ui.ctx());
                 }
             });
         });
@@ -246,15 +411,21 @@ impl EsubpoenaApp {
             
             // Handle file drops
             if !response.dropped_files().is_empty() {
+                let mut xml_files = Vec::new();
                 for dropped_file in response.dropped_files() {
                     if let Some(path) = &dropped_file.path {
                         if path.extension().map_or(false, |ext| ext == "xml") {
-                            self.process_file(path.clone());
+                            xml_files.push(path.clone());
                         } else {
                             self.add_message(Message::Warning("Please drop XML files only".to_string()));
                         }
                     }
                 }
+                
+                // All files dropped together are processed as one batch
+                if !xml_files.is_empty() {
+                    self.process_files(xml_files, ui.ctx());
+                }
             }
             
             // Handle click to browse
@@ -281,22 +452,19 @@ impl EsubpoenaApp {
                 }
             }
             
-            // Statistics
-            if let Some(analytics) = &self.analytics {
+            // Statistics, reusing the values formatted for the stat cards
+            if !self.stat_cards.is_empty() {
                 ui.add_space(20.0);
                 ui.heading("Quick Statistics");
                 
                 ui.horizontal(|ui| {
-                    ui.vertical(|ui| {
-                        ui.label(format!("Total Calls: {}", analytics.total_calls));
-                        ui.label(format!("Incoming: {}", analytics.incoming_calls));
-                        ui.label(format!("Outgoing: {}", analytics.outgoing_calls));
-                    });
-                    ui.vertical(|ui| {
-                        ui.label(format!("Unique Numbers: {}", analytics.unique_numbers));
-                        ui.label(format!("Total Duration: {:.1} min", analytics.total_duration_minutes));
-                        ui.label(format!("Avg Duration: {:.1} min", analytics.average_call_duration));
-                    });
+                    for column in self.stat_cards.chunks(3) {
+                        ui.vertical(|ui| {
+                            for card in column {
+                                ui.label(format!("{}: {}", card.title, card.value));
+                            }
+                        });
+                    }
                 });
             }
         });
@@ -314,14 +482,17 @@ impl EsubpoenaApp {
             ui.label(format!("Showing {} call records", self.call_records.len()));
             ui.with_layout(egui::Layout::right_to_left(egui::Align::Center), |ui| {
                 if ui.button("Export to Excel").clicked() {
-                    self.export_to_excel();
+                    self.export_to_excel(ui.ctx());
                 }
             });
         });
         
-        egui::ScrollArea::vertical().max_height(600.0).show(ui, |ui| {
-            egui::Grid::new("call_records").striped(true).show(ui, |ui| {
-                // Headers
+        // Headers sit outside the scroll area; both grids use the same fixed
+        // column width so they line up and nothing has to be measured per row
+        egui::Grid::new("call_records_header")
+            .min_col_width(GRID_COLUMN_WIDTH)
+            .max_col_width(GRID_COLUMN_WIDTH)
+            .show(ui, |ui| {
                 ui.strong("Direction");
                 ui.strong("Remote Number");
                 ui.strong("Normalized");
@@ -329,22 +500,27 @@ impl EsubpoenaApp {
                 ui.strong("Time");
                 ui.strong("Duration (min)");
                 ui.end_row();
-                
-                // Data (show first 100 records)
-                for record in self.call_records.iter().take(100) {
-                    ui.label(&record.message_direction);
-                    ui.label(&record.remote_number);
-                    ui.label(&record.normalized_number);
-                    ui.label(&record.date);
-                    ui.label(&record.time);
-                    ui.label(format!("{:.2}", record.duration_minutes));
-                    ui.end_row();
-                }
             });
-            
-            if self.call_records.len() > 100 {
-                ui.label(format!("... and {} more records", self.call_records.len() - 100));
-            }
+        
+        // Only the rows in view are laid out each frame, so every record can be listed
+        let row_height = ui.text_style_height(&egui::TextStyle::Body);
+        egui::ScrollArea::vertical().max_height(600.0).show_rows(ui, row_height, self.call_records.len(), |ui, row_range| {
+            egui::Grid::new("call_records")
+                .striped(true)
+                .min_col_width(GRID_COLUMN_WIDTH)
+                .max_col_width(GRID_COLUMN_WIDTH)
+                .start_row(row_range.start)
+                .show(ui, |ui| {
+                    for record in &self.call_records[row_range] {
+                        ui.label(&*record.message_direction);
+                        ui.label(&record.remote_number);
+                        ui.label(format_phone_number(record.normalized_number));
+                        ui.label(record.date().to_string());
+                        ui.label(record.time().to_string());
+                        ui.label(format!("{:.2}", record.duration_minutes()));
+                        ui.end_row();
+                    }
+                });
         });
     }
     
@@ -353,17 +529,18 @@ impl EsubpoenaApp {
             ui.vertical(|ui| {
                 ui.heading("Analytics Dashboard");
                 
-                // Summary cards
+                // Summary cards: counts on the first row, durations on the second
+                let (count_cards, duration_cards) = self.stat_cards.split_at(self.stat_cards.len().min(4));
                 ui.horizontal(|ui| {
-                    self.render_stat_card(ui, "Total Calls", &analytics.total_calls.to_string(), "📞");
-                    self.render_stat_card(ui, "Incoming", &analytics.incoming_calls.to_string(), "📥");
-                    self.render_stat_card(ui, "Outgoing", &analytics.outgoing_calls.to_string(), "📤");
-                    self.render_stat_card(ui, "Unique Numbers", &analytics.unique_numbers.to_string(), "👥");
+                    for card in count_cards {
+                        self.render_stat_card(ui, card.title, &card.value, card.icon);
+                    }
                 });
                 
                 ui.horizontal(|ui| {
-                    self.render_stat_card(ui, "Total Duration", &format!("{:.1} min", analytics.total_duration_minutes), "⏱️");
-                    self.render_stat_card(ui, "Avg Duration", &format!("{:.1} min", analytics.average_call_duration), "📊");
+                    for card in duration_cards {
+                        self.render_stat_card(ui, card.title, &card.value, card.icon);
+                    }
                 });
                 
                 ui.add_space(20.0);
@@ -378,7 +555,7 @@ impl EsubpoenaApp {
                     
                     for (i, (number, count)) in analytics.most_frequent_numbers.iter().enumerate() {
                         ui.label(format!("{}", i + 1));
-                        ui.label(number);
+                        ui.label(format_phone_number(*number));
                         ui.label(count.to_string());
                         ui.end_row();
                     }
@@ -388,20 +565,34 @@ impl EsubpoenaApp {
                 
                 // Calls by day
                 ui.heading("Calls by Day");
-                let mut sorted_days: Vec<_> = analytics.calls_by_day.iter().collect();
-                sorted_days.sort_by(|a, b| a.0.cmp(b.0));
-                
-                egui::Grid::new("calls_by_day").striped(true).show(ui, |ui| {
-                    ui.strong("Date");
-                    ui.strong("Call Count");
-                    ui.end_row();
-                    
-                    for (day, count) in sorted_days {
-                        ui.label(day);
-                        ui.label(count.to_string());
+                egui::Grid::new("calls_by_day_header")
+                    .min_col_width(GRID_COLUMN_WIDTH)
+                    .max_col_width(GRID_COLUMN_WIDTH)
+                    .show(ui, |ui| {
+                        ui.strong("Date");
+                        ui.strong("Call Count");
                         ui.end_row();
-                    }
-                });
+                    });
+                
+                // Multi-year exports have thousands of days; lay out only the visible ones
+                let row_height = ui.text_style_height(&egui::TextStyle::Body);
+                egui::ScrollArea::vertical()
+                    .id_source("calls_by_day_scroll")
+                    .max_height(300.0)
+                    .show_rows(ui, row_height, analytics.calls_by_day.len(), |ui, row_range| {
+                        egui::Grid::new("calls_by_day")
+                            .striped(true)
+                            .min_col_width(GRID_COLUMN_WIDTH)
+                            .max_col_width(GRID_COLUMN_WIDTH)
+                            .start_row(row_range.start)
+                            .show(ui, |ui| {
+                                for (day, count) in &analytics.calls_by_day[row_range] {
+                                    ui.label(day);
+                                    ui.label(count.to_string());
+                                    ui.end_row();
+                                }
+                            });
+                    });
             });
         } else {
             ui.centered_and_justified(|ui| {
@@ -411,15 +602,16 @@ impl EsubpoenaApp {
     }
     
     fn render_summary(&mut self, ui: &mut egui::Ui) {
-        if let Some(analytics) = &self.analytics {
-            let report = AnalyticsEngine::generate_summary_report(analytics);
+        // Generated once by the processing worker instead of on every frame
+        if let Some(report) = &self.summary_report {
+            let mut copied = false;
             
             ui.horizontal(|ui| {
                 ui.label("Summary Report");
                 ui.with_layout(egui::Layout::right_to_left(egui::Align::Center), |ui| {
                     if ui.button("Copy to Clipboard").clicked() {
                         ui.output_mut(|o| o.copied_text = report.clone());
-                        self.add_message(Message::Success("Report copied to clipboard".to_string()));
+                        copied = true;
                     }
                 });
             });
@@ -427,6 +619,10 @@ impl EsubpoenaApp {
             egui::ScrollArea::vertical().max_height(600.0).show(ui, |ui| {
                 ui.add(egui::TextEdit::multiline(&mut report.as_str()).desired_width(f32::INFINITY));
             });
+            
+            if copied {
+                self.add_message(Message::Success("Report copied to clipboard".to_string()));
+            }
         } else {
             ui.centered_and_justified(|ui| {
                 ui.label("No summary available. Please process an XML file first.");
@@ -1,6 +1,21 @@
-use chrono::{DateTime, Utc};
+use chrono::format::{Item, StrftimeItems};
+use chrono::{DateTime, Datelike, NaiveDate, NaiveTime, TimeZone, Utc, Weekday};
+use lazy_static::lazy_static;
 use serde::{Deserialize, Serialize};
-use std::collections::HashMap;
+use std::borrow::Cow;
+use std::sync::Arc;
+
+/// 10^10: normalized numbers keep the last 10 digits
+const PHONE_NUMBER_MODULUS: u64 = 10_000_000_000;
+
+/// Direction spellings seen in exports, borrowed instead of allocated per record
+const KNOWN_DIRECTIONS: [&str; 6] = ["incoming", "outgoing", "Incoming", "Outgoing", "INCOMING", "OUTGOING"];
+
+lazy_static! {
+    // Parsed once; `DateTime::format` would re-parse the pattern for every record
+    static ref DATE_FORMAT: Vec<Item<'static>> = StrftimeItems::new("%Y-%m-%d").collect();
+    static ref TIME_FORMAT: Vec<Item<'static>> = StrftimeItems::new("%H:%M:%S").collect();
+}
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct DataProduct {
@@ -37,19 +52,20 @@ pub struct CallRecord {
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct ProcessedCallRecord {
-    pub message_direction: String,
+    /// Borrowed for the common spellings, so only unusual values own a copy
+    pub message_direction: Cow<'static, str>,
+    /// `message_direction` is "incoming" (any case), decided once at construction
+    pub is_incoming: bool,
     pub remote_number: String,
-    pub normalized_number: String,
-    pub target_number: String,
-    pub source_file: String,
+    /// Last 10 digits of the remote number; display with `format_phone_number`
+    pub normalized_number: u64,
+    /// Shared by every record of the same file rather than copied per record
+    pub target_number: Arc<str>,
+    pub source_file: Arc<str>,
     pub start_time: DateTime<Utc>,
     pub end_time: DateTime<Utc>,
     pub length_of_call: u32,
-    pub duration_minutes: f64,
-    pub date: String,
-    pub time: String,
-    pub date_time: String,
-    pub day_of_week: String,
+    pub day_of_week: Weekday,
 }
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
@@ -60,12 +76,17 @@ pub struct Analytics {
     pub total_duration_minutes: f64,
     pub average_call_duration: f64,
     pub unique_numbers: usize,
-    pub most_frequent_numbers: Vec<(String, usize)>,
-    pub calls_by_day: HashMap<String, usize>,
-    pub calls_by_hour: HashMap<u32, usize>,
+    pub most_frequent_numbers: Vec<(u64, usize)>,
+    /// `(YYYY-MM-DD, count)` sorted by date; a Vec so the virtualized grid
+    /// can slice out the visible rows directly
+    pub calls_by_day: Vec<(String, usize)>,
+    /// Call counts indexed by hour of day (0-23)
+    pub calls_by_hour: [usize; 24],
     pub longest_call: Option<ProcessedCallRecord>,
     pub shortest_call: Option<ProcessedCallRecord>,
     pub target_numbers: std::collections::HashSet<String>,
+    /// Number of records under each target number
+    pub calls_by_target: std::collections::HashMap<String, usize>,
     pub common_contacts: Vec<CommonContact>,
     pub files_processed: std::collections::HashSet<String>,
     pub date_range: (DateTime<Utc>, DateTime<Utc>),
@@ -73,62 +94,186 @@ pub struct Analytics {
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct CommonContact {
-    pub number: String,
+    pub number: u64,
     pub target_numbers: Vec<String>,
     pub count: usize,
 }
 
 impl ProcessedCallRecord {
-    pub fn from_call_record(call: &CallRecord, target_number: &str, source_file: &str) -> Result<Self, Box<dyn std::error::Error>> {
-        let start_time = DateTime::parse_from_rfc3339(&call.start_time)?.with_timezone(&Utc);
-        let end_time = DateTime::parse_from_rfc3339(&call.end_time)?.with_timezone(&Utc);
+    pub fn from_call_record(call: CallRecord, target_number: &Arc<str>, source_file: &Arc<str>) -> Result<Self, Box<dyn std::error::Error>> {
+        let start_time = parse_timestamp(&call.start_time)?;
+        let end_time = parse_timestamp(&call.end_time)?;
         
+        let is_incoming = call.message_direction.eq_ignore_ascii_case("incoming");
         let normalized_number = normalize_phone_number(&call.remote_number);
-        let duration_minutes = call.length_of_call as f64 / 60.0;
         
+        // The raw strings are moved over; `start_time`/`end_time` are dropped
+        // once parsed
         Ok(Self {
-            message_direction: call.message_direction.clone(),
-            remote_number: call.remote_number.clone(),
+            message_direction: intern_direction(call.message_direction),
+            is_incoming,
+            remote_number: call.remote_number,
             normalized_number,
-            target_number: target_number.to_string(),
-            source_file: source_file.to_string(),
+            target_number: Arc::clone(target_number),
+            source_file: Arc::clone(source_file),
             start_time,
             end_time,
             length_of_call: call.length_of_call,
-            duration_minutes,
-            date: start_time.format("%Y-%m-%d").to_string(),
-            time: start_time.format("%H:%M:%S").to_string(),
-            date_time: start_time.format("%Y-%m-%d %H:%M:%S").to_string(),
-            day_of_week: start_time.format("%A").to_string(),
+            day_of_week: start_time.weekday(),
         })
     }
+    
+    /// Start date as `YYYY-MM-DD`, formatted only when displayed
+    pub fn date(&self) -> impl std::fmt::Display {
+        self.start_time.format_with_items(DATE_FORMAT.iter())
+    }
+    
+    /// Start time as `HH:MM:SS`, formatted only when displayed
+    pub fn time(&self) -> impl std::fmt::Display {
+        self.start_time.format_with_items(TIME_FORMAT.iter())
+    }
+    
+    /// Call length in minutes, derived from the stored whole seconds
+    pub fn duration_minutes(&self) -> f64 {
+        self.length_of_call as f64 / 60.0
+    }
+    
+    /// Full English weekday name, e.g. "Monday"
+    pub fn day_of_week_name(&self) -> &'static str {
+        match self.day_of_week {
+            Weekday::Mon => "Monday",
+            Weekday::Tue => "Tuesday",
+            Weekday::Wed => "Wednesday",
+            Weekday::Thu => "Thursday",
+            Weekday::Fri => "Friday",
+            Weekday::Sat => "Saturday",
+            Weekday::Sun => "Sunday",
+        }
+    }
+}
+
+fn intern_direction(direction: String) -> Cow<'static, str> {
+    match KNOWN_DIRECTIONS.iter().find(|known| **known == direction) {
+        Some(known) => Cow::Borrowed(known),
+        None => Cow::Owned(direction),
+    }
 }
 
-pub fn normalize_phone_number(number: &str) -> String {
-    use regex::Regex;
-    use lazy_static::lazy_static;
+/// Parses an RFC 3339 timestamp, with a fast path for the fixed-width
+/// `YYYY-MM-DDTHH:MM:SSZ` form the exports use
+fn parse_timestamp(value: &str) -> Result<DateTime<Utc>, chrono::ParseError> {
+    if let Some(timestamp) = parse_fixed_width_utc(value) {
+        return Ok(timestamp);
+    }
+    Ok(DateTime::parse_from_rfc3339(value)?.with_timezone(&Utc))
+}
+
+fn parse_fixed_width_utc(value: &str) -> Option<DateTime<Utc>> {
+    let bytes = value.as_bytes();
+    if bytes.len() != 20
+        || bytes[4] != b'-' || bytes[7] != b'-'
+        || !matches!(bytes[10], b'T' | b't')
+        || bytes[13] != b':' || bytes[16] != b':'
+        || !matches!(bytes[19], b'Z' | b'z')
+    {
+        return None;
+    }
+    
+    let field = |range: std::ops::Range<usize>| -> Option<u32> {
+        bytes[range].iter().try_fold(0, |value, &digit| {
+            digit.is_ascii_digit().then(|| value * 10 + u32::from(digit - b'0'))
+        })
+    };
+    
+    // Anything out of range (including leap seconds) goes through the full parser
+    let date = NaiveDate::from_ymd_opt(field(0..4)? as i32, field(5..7)?, field(8..10)?)?;
+    let time = NaiveTime::from_hms_opt(field(11..13)?, field(14..16)?, field(17..19)?)?;
+    Some(Utc.from_utc_datetime(&date.and_time(time)))
+}
+
+pub fn normalize_phone_number(number: &str) -> u64 {
+    // Fold the digits in one pass, keeping only the last 10: punctuation is
+    // skipped, the leading 1 of an 11-digit number falls off, and shorter
+    // numbers are zero-padded when formatted
+    number.bytes()
+        .filter(u8::is_ascii_digit)
+        .fold(0, |value, digit| (value * 10 + u64::from(digit - b'0')) % PHONE_NUMBER_MODULUS)
+}
+
+pub fn format_phone_number(number: u64) -> String {
+    format!("{:010}", number)
+} 
+
+#[cfg(test)]
+mod tests {
+    use super::*;
     
-    lazy_static! {
-        static ref PHONE_REGEX: Regex = Regex::new(r"[^\d]").unwrap();
+    fn rfc3339(value: &str) -> DateTime<Utc> {
+        DateTime::parse_from_rfc3339(value).unwrap().with_timezone(&Utc)
     }
     
-    let digits_only = PHONE_REGEX.replace_all(number, "");
+    #[test]
+    fn fixed_width_utc_matches_rfc3339() {
+        for value in ["2024-03-05T14:07:09Z", "2024-03-05t14:07:09z", "1999-12-31T23:59:59Z", "2024-02-29T00:00:00Z"] {
+            assert_eq!(parse_fixed_width_utc(value), Some(rfc3339(value)), "{}", value);
+            assert_eq!(parse_timestamp(value).unwrap(), rfc3339(value), "{}", value);
+        }
+    }
+    
+    #[test]
+    fn leap_second_falls_back_to_rfc3339() {
+        let value = "2016-12-31T23:59:60Z";
+        assert_eq!(parse_fixed_width_utc(value), None);
+        assert_eq!(parse_timestamp(value).unwrap(), rfc3339(value));
+    }
     
-    // If it's a 10-digit number, return as is
-    if digits_only.len() == 10 {
-        return digits_only.to_string();
+    #[test]
+    fn out_of_range_fields_are_rejected() {
+        for value in ["2024-02-30T10:00:00Z", "2024-13-01T10:00:00Z", "2024-03-05T24:00:00Z", "2024-03-05T14:61:09Z"] {
+            assert_eq!(parse_fixed_width_utc(value), None, "{}", value);
+            assert!(parse_timestamp(value).is_err(), "{}", value);
+            assert!(DateTime::parse_from_rfc3339(value).is_err(), "{}", value);
+        }
     }
     
-    // If it's 11 digits and starts with 1, remove the 1
-    if digits_only.len() == 11 && digits_only.starts_with('1') {
-        return digits_only[1..].to_string();
+    #[test]
+    fn offsets_and_fractions_fall_back_to_rfc3339() {
+        for value in ["2024-03-05T14:07:09+02:00", "2024-03-05T14:07:09-05:30", "2024-03-05T14:07:09.250Z", "2024-03-05T14:07:09.5+01:00"] {
+            assert_eq!(parse_fixed_width_utc(value), None, "{}", value);
+            assert_eq!(parse_timestamp(value).unwrap(), rfc3339(value), "{}", value);
+        }
     }
     
-    // If it's longer than 10 digits, take the last 10
-    if digits_only.len() > 10 {
-        return digits_only[digits_only.len() - 10..].to_string();
+    #[test]
+    fn malformed_shapes_are_rejected() {
+        for value in ["", "2024-03-05", "2024-03-05 14:07:09Z", "2024/03/05T14:07:09Z", "2024-03-05T14:07:0xZ"] {
+            assert_eq!(parse_fixed_width_utc(value), None, "{}", value);
+        }
     }
     
-    // Otherwise, pad with zeros to make it 10 digits
-    format!("{:0>10}", digits_only)
+    #[test]
+    fn phone_numbers_normalize_to_the_last_ten_digits() {
+        let cases = [
+            // 10 digits, punctuation dropped
+            ("(256) 555-1212", "2565551212"),
+            ("256.555.1212", "2565551212"),
+            // 11 digits with the leading country code 1
+            ("+1 (256) 555-1212", "2565551212"),
+            ("12565551212", "2565551212"),
+            // 11 digits without a leading 1, and longer international numbers
+            ("92565551212", "2565551212"),
+            ("+44 20 7946 0958", "2079460958"),
+            ("0044 20 7946 0958", "2079460958"),
+            // Short numbers are zero-padded on the left
+            ("555-1212", "0005551212"),
+            ("911", "0000000911"),
+            ("0", "0000000000"),
+            // No digits at all
+            ("", "0000000000"),
+            ("unknown", "0000000000"),
+        ];
+        for (input, expected) in cases {
+            assert_eq!(format_phone_number(normalize_phone_number(input)), expected, "{}", input);
+        }
+    }
 } 
\ No newline at end of file
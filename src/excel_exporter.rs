@@ -1,6 +1,7 @@
-use crate::data_models::{Analytics, ProcessedCallRecord};
+use crate::data_models::{format_phone_number, Analytics, ProcessedCallRecord};
 use anyhow::{Context, Result};
 use log::info;
+use std::fmt::Write;
 use std::path::Path;
 use xlsxwriter::{Format, Workbook, Worksheet};
 
@@ -14,7 +15,10 @@ impl ExcelExporter {
     ) -> Result<()> {
         info!("Exporting data to Excel: {:?}", output_path);
         
-        let workbook = Workbook::new(output_path.to_str().unwrap())
+        // Constant-memory mode flushes each row to the temp file as soon as the
+        // next one starts instead of holding every cell until close; every
+        // sheet below is written strictly top to bottom, as that mode requires
+        let workbook = Workbook::new_with_options(output_path.to_str().unwrap(), true, None, false)
             .with_context(|| format!("Failed to create workbook at {:?}", output_path))?;
         
         // Create formats
@@ -46,7 +50,7 @@ impl ExcelExporter {
         Self::export_analytics(&workbook, analytics, &header_format, &text_format, &number_format)?;
         
         // Export summary report
-        Self::export_summary_report(&workbook, analytics, records, &header_format, &text_format)?;
+        Self::export_summary_report(&workbook, analytics, &header_format, &text_format)?;
         
         // Export common contacts
         Self::export_common_contacts(&workbook, analytics, &header_format, &text_format)?;
@@ -92,18 +96,26 @@ impl ExcelExporter {
         }
         
         // Write data
+        let mut date_time = String::new();
+        let mut normalized_number = String::new();
         for (row, record) in records.iter().enumerate() {
             let row_num = (row + 1) as u32;
             
+            // Format straight into reused buffers instead of a String per cell
+            date_time.clear();
+            let _ = write!(date_time, "{} {}", record.date(), record.time());
+            normalized_number.clear();
+            let _ = write!(normalized_number, "{:010}", record.normalized_number);
+            
             worksheet.write_string(row_num, 0, &record.message_direction, Some(text_format))?;
             worksheet.write_string(row_num, 1, &record.target_number, Some(text_format))?;
             worksheet.write_string(row_num, 2, &record.remote_number, Some(text_format))?;
-            worksheet.write_string(row_num, 3, &record.normalized_number, Some(text_format))?;
-            worksheet.write_string(row_num, 4, &record.date_time, Some(text_format))?;
+            worksheet.write_string(row_num, 3, &normalized_number, Some(text_format))?;
+            worksheet.write_string(row_num, 4, &date_time, Some(text_format))?;
             worksheet.write_datetime(row_num, 5, &record.end_time, Some(date_format))?;
             worksheet.write_number(row_num, 6, record.length_of_call as f64, Some(number_format))?;
-            worksheet.write_number(row_num, 7, record.duration_minutes, Some(duration_format))?;
-            worksheet.write_string(row_num, 8, &record.day_of_week, Some(text_format))?;
+            worksheet.write_number(row_num, 7, record.duration_minutes(), Some(duration_format))?;
+            worksheet.write_string(row_num, 8, record.day_of_week_name(), Some(text_format))?;
             worksheet.write_string(row_num, 9, &record.source_file, Some(text_format))?;
         }
         
@@ -149,7 +161,7 @@ impl ExcelExporter {
         
         for (i, (number, count)) in analytics.most_frequent_numbers.iter().enumerate() {
             let row_num = start_row + 1 + i as u32;
-            worksheet.write_string(row_num, 0, number, Some(text_format))?;
+            worksheet.write_string(row_num, 0, &format_phone_number(*number), Some(text_format))?;
             worksheet.write_number(row_num, 1, *count as f64, Some(number_format))?;
         }
         
@@ -158,22 +170,19 @@ impl ExcelExporter {
         worksheet.write_string(day_start_row, 0, "Calls by Day", Some(header_format))?;
         worksheet.write_string(day_start_row, 1, "Call Count", Some(header_format))?;
         
-        let mut sorted_days: Vec<_> = analytics.calls_by_day.iter().collect();
-        sorted_days.sort_by(|a, b| a.0.cmp(b.0));
-        
-        for (i, (day, count)) in sorted_days.iter().enumerate() {
+        for (i, (day, count)) in analytics.calls_by_day.iter().enumerate() {
             let row_num = day_start_row + 1 + i as u32;
             worksheet.write_string(row_num, 0, day, Some(text_format))?;
-            worksheet.write_number(row_num, 1, **count as f64, Some(number_format))?;
+            worksheet.write_number(row_num, 1, *count as f64, Some(number_format))?;
         }
         
         // Calls by hour
-        let hour_start_row = day_start_row + sorted_days.len() as u32 + 3;
+        let hour_start_row = day_start_row + analytics.calls_by_day.len() as u32 + 3;
         worksheet.write_string(hour_start_row, 0, "Calls by Hour", Some(header_format))?;
         worksheet.write_string(hour_start_row, 1, "Call Count", Some(header_format))?;
         
-        for hour in 0..24 {
-            if let Some(count) = analytics.calls_by_hour.get(&hour) {
+        for (hour, count) in analytics.calls_by_hour.iter().enumerate() {
+            if *count > 0 {
                 let row_num = hour_start_row + 1 + hour as u32;
                 worksheet.write_string(row_num, 0, &format!("{:02}:00", hour), Some(text_format))?;
                 worksheet.write_number(row_num, 1, *count as f64, Some(number_format))?;
@@ -186,7 +195,6 @@ impl ExcelExporter {
     fn export_summary_report(
         workbook: &Workbook,
         analytics: &Analytics,
-        records: &[ProcessedCallRecord],
         header_format: &Format,
         text_format: &Format,
     ) -> Result<()> {
@@ -195,10 +203,8 @@ impl ExcelExporter {
         // Set column width
         worksheet.set_column(0, 0, 80.0, None)?;
         
-        let report = crate::analytics::AnalyticsEngine::generate_summary_report(analytics, records);
-        let lines: Vec<&str> = report.lines().collect();
-        
-        for (row, line) in lines.iter().enumerate() {
+        let report = crate::analytics::AnalyticsEngine::generate_summary_report(analytics);
+        for (row, line) in report.lines().enumerate() {
             let row_num = row as u32;
             if line.starts_with("===") {
                 worksheet.write_string(row_num, 0, line, Some(header_format))?;
@@ -239,7 +245,7 @@ impl ExcelExporter {
             let row_num = (row + 1) as u32;
             let target_nums = contact.target_numbers.join(", ");
             
-            worksheet.write_string(row_num, 0, &contact.number, Some(text_format))?;
+            worksheet.write_string(row_num, 0, &format_phone_number(contact.number), Some(text_format))?;
             worksheet.write_string(row_num, 1, &target_nums, Some(text_format))?;
             worksheet.write_number(row_num, 2, contact.count as f64, Some(text_format))?;
         }
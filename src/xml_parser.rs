@@ -2,16 +2,49 @@ use crate::data_models::{CallRecord, DataProduct, Lds101Results, ProcessedCallRe
 use anyhow::{Context, Result};
 use log::{info, warn};
 use quick_xml::de::from_str;
-use std::fs;
+use quick_xml::events::BytesText;
+use quick_xml::Reader;
+use std::fs::File;
+use std::io::{BufRead, BufReader};
 use std::path::Path;
+use std::sync::Arc;
 
 pub struct XmlParser;
 
+const READ_BUFFER_SIZE: usize = 64 * 1024;
+
+/// Elements whose text is extracted; everything else is skipped without
+/// allocating its name or contents
+#[derive(Debug, Clone, Copy, PartialEq)]
+enum Field {
+    MessageDirection,
+    RemoteNumber,
+    StartTime,
+    EndTime,
+    LengthOfCall,
+    TargetValue,
+    Other,
+}
+
+impl Field {
+    fn from_name(name: &[u8]) -> Self {
+        match name {
+            b"messageDirection" => Field::MessageDirection,
+            b"remoteNumber" => Field::RemoteNumber,
+            b"startTime" => Field::StartTime,
+            b"endTime" => Field::EndTime,
+            b"lengthOfCall" => Field::LengthOfCall,
+            b"targetValue" => Field::TargetValue,
+            _ => Field::Other,
+        }
+    }
+}
+
 impl XmlParser {
     pub fn parse_file(file_path: &Path) -> Result<Vec<ProcessedCallRecord>> {
         info!("Parsing XML file: {:?}", file_path);
         
-        let content = fs::read_to_string(file_path)
+        let file = File::open(file_path)
             .with_context(|| format!("Failed to read file: {:?}", file_path))?;
         
         let source_file = file_path.file_name()
@@ -19,7 +52,12 @@ impl XmlParser {
             .unwrap_or("unknown")
             .to_string();
         
-        Self::parse_content_with_source(&content, &source_file)
+        // Stream the document instead of loading it into memory first; each
+        // <results> element is converted as soon as it is closed. A larger
+        // buffer than the 8 KiB default cuts the number of read calls on big
+        // toll exports
+        let reader = BufReader::with_capacity(READ_BUFFER_SIZE, file);
+        Self::parse_events_with_source(Reader::from_reader(reader), &source_file)
     }
     
     pub fn parse_content(content: &str) -> Result<Vec<ProcessedCallRecord>> {
@@ -58,8 +96,10 @@ impl XmlParser {
         
         let mut processed_records = Vec::new();
         
-        for (index, call_record) in lds_results.results.iter().enumerate() {
-            match ProcessedCallRecord::from_call_record(call_record, &lds_results.target_value, source_file) {
+        let target_value: Arc<str> = Arc::from(lds_results.target_value);
+        let source_file: Arc<str> = Arc::from(source_file);
+        for (index, call_record) in lds_results.results.into_iter().enumerate() {
+            match ProcessedCallRecord::from_call_record(call_record, &target_value, &source_file) {
                 Ok(processed) => {
                     processed_records.push(processed);
                 }
@@ -78,24 +118,35 @@ impl XmlParser {
     }
     
     fn parse_manual_with_source(content: &str, source_file: &str) -> Result<Vec<ProcessedCallRecord>> {
+        let processed_records = Self::parse_events_with_source(Reader::from_str(content), source_file)?;
+        info!("Manually parsed {} call records", processed_records.len());
+        Ok(processed_records)
+    }
+    
+    fn parse_events_with_source<R: BufRead>(mut reader: Reader<R>, source_file: &str) -> Result<Vec<ProcessedCallRecord>> {
         use quick_xml::events::Event;
-        use quick_xml::Reader;
         
-        let mut reader = Reader::from_str(content);
         reader.trim_text(true);
         
+        let source_file: Arc<str> = Arc::from(source_file);
+        
         let mut buf = Vec::new();
-        let mut call_records = Vec::new();
+        let mut processed_records = Vec::new();
+        // Records closed before <targetValue> has been seen wait here until it is known
+        let mut pending_records: Vec<CallRecord> = Vec::new();
         let mut current_record: Option<CallRecord> = None;
-        let mut current_element = String::new();
-        let mut target_value = String::new();
+        let mut current_field = Field::Other;
+        let mut target_value: Option<Arc<str>> = None;
         
         loop {
-            match reader.read_event_into(&mut buf)? {
+            let event = reader.read_event_into(&mut buf)
+                .with_context(|| format!("Malformed XML in {} near byte {}", source_file, reader.buffer_position()))?;
+            match event {
                 Event::Start(ref e) => {
-                    current_element = String::from_utf8_lossy(e.name().as_ref()).to_string();
+                    let name = e.name();
+                    current_field = Field::from_name(name.as_ref());
                     
-                    if current_element == "results" {
+                    if name.as_ref() == b"results" {
                         current_record = Some(CallRecord {
                             message_direction: String::new(),
                             remote_number: String::new(),
@@ -105,32 +156,35 @@ impl XmlParser {
                         });
                     }
                 }
-                Event::Text(e) => {
-                    let text = String::from_utf8_lossy(&e).to_string();
-                    
+                Event::Text(ref e) if current_field != Field::Other => {
                     if let Some(ref mut record) = current_record {
-                        match current_element.as_str() {
-                            "messageDirection" => record.message_direction = text,
-                            "remoteNumber" => record.remote_number = text,
-                            "startTime" => record.start_time = text,
-                            "endTime" => record.end_time = text,
-                            "lengthOfCall" => {
-                                if let Ok(length) = text.parse::<u32>() {
+                        match current_field {
+                            Field::MessageDirection => record.message_direction = Self::text_of(e),
+                            Field::RemoteNumber => record.remote_number = Self::text_of(e),
+                            Field::StartTime => record.start_time = Self::text_of(e),
+                            Field::EndTime => record.end_time = Self::text_of(e),
+                            Field::LengthOfCall => {
+                                if let Some(length) = std::str::from_utf8(e).ok().and_then(|t| t.parse::<u32>().ok()) {
                                     record.length_of_call = length;
                                 }
                             }
-                            _ => {}
+                            Field::TargetValue | Field::Other => {}
                         }
-                    } else if current_element == "targetValue" {
-                        target_value = text;
+                    } else if current_field == Field::TargetValue {
+                        let text: Arc<str> = Arc::from(Self::text_of(e));
+                        for call_record in pending_records.drain(..) {
+                            Self::push_processed(&mut processed_records, call_record, &text, &source_file);
+                        }
+                        target_value = Some(text);
                     }
                 }
                 Event::End(ref e) => {
-                    let end_element = String::from_utf8_lossy(e.name().as_ref()).to_string();
-                    
-                    if end_element == "results" {
+                    if e.name().as_ref() == b"results" {
                         if let Some(record) = current_record.take() {
-                            call_records.push(record);
+                            match &target_value {
+                                Some(target) => Self::push_processed(&mut processed_records, record, target, &source_file),
+                                None => pending_records.push(record),
+                            }
                         }
                     }
                 }
@@ -141,16 +195,88 @@ impl XmlParser {
             buf.clear();
         }
         
-        info!("Manually parsed {} call records", call_records.len());
-        
-        let mut processed_records = Vec::new();
-        for call_record in call_records {
-            match ProcessedCallRecord::from_call_record(&call_record, &target_value, source_file) {
-                Ok(processed) => processed_records.push(processed),
-                Err(e) => warn!("Failed to process manually parsed record: {}", e),
-            }
+        let no_target: Arc<str> = Arc::from("");
+        for call_record in pending_records {
+            Self::push_processed(&mut processed_records, call_record, &no_target, &source_file);
         }
         
+        info!("Successfully processed {} call records", processed_records.len());
         Ok(processed_records)
     }
+    
+    /// Element text with entities such as `&amp;` or `&#43;` decoded; text
+    /// that fails to unescape falls back to a lossy copy of the raw bytes
+    fn text_of(text: &BytesText) -> String {
+        match text.unescape() {
+            Ok(unescaped) => unescaped.into_owned(),
+            Err(_) => String::from_utf8_lossy(text).into_owned(),
+        }
+    }
+    
+    fn push_processed(processed_records: &mut Vec<ProcessedCallRecord>, call_record: CallRecord, target_value: &Arc<str>, source_file: &Arc<str>) {
+        match ProcessedCallRecord::from_call_record(call_record, target_value, source_file) {
+            Ok(processed) => processed_records.push(processed),
+            Err(e) => warn!("Failed to process call record: {}", e),
+        }
+    }
+} 
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    
+    fn record(remote_number: &str) -> String {
+        format!(
+            "<results><messageDirection>incoming</messageDirection><remoteNumber>{}</remoteNumber>\
+             <startTime>2024-03-05T14:07:09Z</startTime><endTime>2024-03-05T14:08:09Z</endTime>\
+             <lengthOfCall>60</lengthOfCall></results>",
+            remote_number
+        )
+    }
+    
+    fn parse(xml: &str) -> Vec<(String, String)> {
+        let records = XmlParser::parse_events_with_source(Reader::from_reader(xml.as_bytes()), "test.xml").unwrap();
+        records.into_iter()
+            .map(|r| (r.target_number.to_string(), r.remote_number))
+            .collect()
+    }
+    
+    fn pairs(expected: &[(&str, &str)]) -> Vec<(String, String)> {
+        expected.iter().map(|(t, n)| (t.to_string(), n.to_string())).collect()
+    }
+    
+    #[test]
+    fn target_before_records() {
+        let xml = format!("<xmlResult><targetValue>2565550000</targetValue>{}{}</xmlResult>", record("1"), record("2"));
+        assert_eq!(parse(&xml), pairs(&[("2565550000", "1"), ("2565550000", "2")]));
+    }
+    
+    #[test]
+    fn target_after_records() {
+        let xml = format!("<xmlResult>{}{}<targetValue>2565550000</targetValue></xmlResult>", record("1"), record("2"));
+        assert_eq!(parse(&xml), pairs(&[("2565550000", "1"), ("2565550000", "2")]));
+    }
+    
+    #[test]
+    fn missing_target_leaves_it_empty() {
+        let xml = format!("<xmlResult>{}{}</xmlResult>", record("1"), record("2"));
+        assert_eq!(parse(&xml), pairs(&[("", "1"), ("", "2")]));
+    }
+    
+    #[test]
+    fn records_take_the_target_current_when_they_close() {
+        let xml = format!(
+            "<xmlResult>{}<targetValue>A</targetValue>{}<targetValue>B</targetValue>{}</xmlResult>",
+            record("1"), record("2"), record("3")
+        );
+        assert_eq!(parse(&xml), pairs(&[("A", "1"), ("A", "2"), ("B", "3")]));
+    }
+    
+    #[test]
+    fn source_file_is_attached_to_every_record() {
+        let xml = format!("<xmlResult><targetValue>A</targetValue>{}</xmlResult>", record("1"));
+        let records = XmlParser::parse_events_with_source(Reader::from_reader(xml.as_bytes()), "test.xml").unwrap();
+        assert_eq!(records.len(), 1);
+        assert_eq!(&*records[0].source_file, "test.xml");
+    }
 } 
\ No newline at end of file